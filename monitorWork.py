@@ -23,50 +23,219 @@ except ImportError:
     print("2. Install tkinter support: brew install python-tk")
     sys.exit(1)
 
-from tkinter import ttk, messagebox, filedialog, simpledialog
+# filedialog, simpledialog, subprocess, tempfile and concurrent.futures are
+# imported where they're used, to keep them off the startup path
+from tkinter import ttk, messagebox
+import errno
 import json
-import subprocess
+import re
 import fcntl
-import tempfile
+import shutil
+import signal
+import socket
+import stat
+import threading
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
+
+# orjson is optional; fall back to the standard library if it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configuration
 CONFIG_DIR = Path.home() / ".workmonitor"
 CONFIG_FILE = CONFIG_DIR / "repositories.json"
 LOCK_FILE = CONFIG_DIR / "monitorWork.lock"
+WORK_COMMANDS = ('startWork', 'stopWork', 'tabulateWork')
+
+# date.fromisoformat also accepts forms like 20240101, so pin the shape first
+DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# Checkbox glyphs indexed by selection state, and the click toggle between them
+GLYPHS = ("☐", "☑")
+TOGGLE = {"☑": "☐", "☐": "☑"}
+
+# Shown instead of a checkbox for saved entries that are no longer git repositories
+UNAVAILABLE = "⚠"
+
+def run_repo_command(command, repo_path, timeout=30):
+    """Run command on repo_path; return stderr on failure or None on success.
+    
+    command should be an absolute path (see WorkMonitorGUI.find_command) so
+    the child skips the PATH search. The child gets its own session so a
+    timeout kills the whole process group (including the git processes it
+    spawned), not just the wrapper script.
+    """
+    import subprocess
+    
+    proc = subprocess.Popen(
+        [command, repo_path],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors='replace',
+        env=os.environ,
+        start_new_session=True
+    )
+    try:
+        _, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass  # The group exited on its own in the meantime
+        proc.communicate()
+        raise
+    return stderr if proc.returncode != 0 else None
+
+def has_git_dir(path):
+    """Return whether path/.git is a directory, using a single stat call."""
+    try:
+        st = os.stat(os.path.join(path, '.git'))
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode)
+
+def loads_json(raw):
+    """Parse JSON from bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def dumps_json(obj):
+    """Serialize obj to indented JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
 
 class SingleInstance:
-    """Ensure only one instance of the application runs at a time."""
+    """Ensure only one instance of the application runs at a time.
+    
+    The lock is taken by hard-linking a private temp file to the lock file,
+    which is atomic even on NFS/Lustre where flock() may silently succeed.
+    A POSIX record lock is held on top of that, so a lock file left behind
+    by a crash is recognised by nobody holding a record lock on it. Only
+    where record locking is unsupported does this fall back to checking
+    the PID and hostname written into the file.
+    """
     def __init__(self, lock_file):
         self.lock_file = lock_file
         self.lock_fd = None
+        self._owned_ino = None
         
     def __enter__(self):
         # Create config directory if it doesn't exist
         self.lock_file.parent.mkdir(parents=True, exist_ok=True)
         
+        if not self._acquire():
+            self.__exit__(None, None, None)
+            self._already_running()
+        return self
+    
+    def _acquire(self):
+        """Take the lock file, replacing a stale one; return True on success."""
         try:
-            self.lock_fd = open(self.lock_file, 'w')
-            fcntl.flock(self.lock_fd.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-            self.lock_fd.write(str(os.getpid()))
-            self.lock_fd.flush()
-            return self
-        except (IOError, OSError):
-            messagebox.showerror(
-                "Already Running",
-                "monitorWork.py is already running.\nOnly one instance can run at a time."
-            )
-            sys.exit(1)
+            if not self._link_lock():
+                # The previous owner may have died without cleaning up
+                if not self._lock_is_stale():
+                    return False
+                try:
+                    self.lock_file.unlink()
+                except FileNotFoundError:
+                    pass
+                if not self._link_lock():
+                    return False
+            
+            self.lock_fd = open(self.lock_file, 'r+')
+            # Another instance replacing a lock it judged stale in the
+            # meantime leaves a different file at the path; it owns that one
+            if os.fstat(self.lock_fd.fileno()).st_ino != self._owned_ino:
+                return False
+        except OSError:
+            return False
+        
+        try:
+            fcntl.lockf(self.lock_fd.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError as e:
+            if e.errno not in (errno.ENOSYS, errno.EINVAL, errno.ENOLCK):
+                # Another instance is probing this file to see if it is stale
+                return False
+            print(f"Warning: record locking not supported for {self.lock_file}: {e}")
+        return True
+    
+    def _link_lock(self):
+        """Try to create the lock file via link(2); return True if we own it."""
+        import tempfile
+        
+        with tempfile.NamedTemporaryFile('w', dir=self.lock_file.parent,
+                                         prefix='.lock-', delete=False) as tmp:
+            tmp.write(f"{os.getpid()}@{socket.gethostname()}\n")
+        try:
+            try:
+                os.link(tmp.name, self.lock_file)
+            except FileExistsError:
+                pass
+            # link() can report failure over NFS even though it succeeded,
+            # so trust the link count of our temp file instead
+            st = os.stat(tmp.name)
+            if st.st_nlink == 2:
+                self._owned_ino = st.st_ino
+                return True
+            return False
+        finally:
+            os.unlink(tmp.name)
+    
+    def _lock_is_stale(self):
+        """Return True if no running instance holds the existing lock file."""
+        try:
+            with open(self.lock_file, 'r+') as f:
+                try:
+                    # Granted only if the owner has exited; closing f drops it
+                    fcntl.lockf(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return True
+                except OSError as e:
+                    if e.errno not in (errno.ENOSYS, errno.EINVAL, errno.ENOLCK):
+                        return False
+                owner = f.read().strip()
+        except FileNotFoundError:
+            return True
+        
+        # Without record locking, fall back to probing the recorded owner
+        pid, _, host = owner.partition('@')
+        if host and host != socket.gethostname():
+            # Can't probe a process on another machine
+            return False
+        try:
+            os.kill(int(pid), 0)
+        except (ValueError, ProcessLookupError):
+            return True
+        except PermissionError:
+            return False
+        return False
+    
+    def _already_running(self):
+        messagebox.showerror(
+            "Already Running",
+            "monitorWork.py is already running.\nOnly one instance can run at a time.\n\n"
+            f"Check if another instance is running or remove {self.lock_file}"
+        )
+        sys.exit(1)
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.lock_fd:
             try:
-                fcntl.flock(self.lock_fd.fileno(), fcntl.LOCK_UN)
-                self.lock_fd.close()
-                if self.lock_file.exists():
+                fcntl.lockf(self.lock_fd.fileno(), fcntl.LOCK_UN)
+            except OSError:
+                pass
+            self.lock_fd.close()
+        if self._owned_ino is not None:
+            try:
+                # Only remove the lock if it is still the one we created
+                if os.stat(self.lock_file).st_ino == self._owned_ino:
                     self.lock_file.unlink()
-            except:
+            except OSError:
                 pass
 
 class WorkMonitorGUI:
@@ -75,8 +244,23 @@ class WorkMonitorGUI:
         self.root.title("WorkMonitor")
         self.root.geometry("800x600")
         
-        # Repository list (list of dicts with 'path' and 'selected')
-        self.repositories = []
+        # Repositories keyed by path, mapping to whether each is selected
+        self.repositories = {}
+        
+        # Glyph currently displayed for each tree row, keyed by path (the row iid)
+        self._shown_glyphs = {}
+        
+        # Saved entries that are no longer git repositories, keyed by path and
+        # mapping to whether each was selected. They are listed but can't be
+        # selected, and are saved unchanged until removed.
+        self._unavailable = {}
+        
+        # Saves are deferred and coalesced; see _schedule_save
+        self._save_pending_id = None
+        self._dirty = False
+        
+        # Resolve the work scripts once at startup so children skip the PATH search
+        self._commands = {name: shutil.which(name) for name in WORK_COMMANDS}
         
         # Load saved repositories
         self.load_repositories()
@@ -87,6 +271,14 @@ class WorkMonitorGUI:
         # Update repository list display
         self.update_repo_list()
         
+        missing = [name for name, exe in self._commands.items() if exe is None]
+        if missing:
+            messagebox.showwarning(
+                "Warning",
+                f"Command(s) not found: {', '.join(missing)}.\n"
+                "Please ensure they're installed and in your PATH."
+            )
+        
         # Handle window close
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
     
@@ -122,6 +314,7 @@ class WorkMonitorGUI:
         self.repo_tree.column('#0', width=30, stretch=False)
         self.repo_tree.column('selected', width=80, stretch=False)
         self.repo_tree.column('path', width=500, stretch=True)
+        self.repo_tree.tag_configure('unavailable', foreground='gray')
         
         # Scrollbar
         scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.repo_tree.yview)
@@ -158,9 +351,14 @@ class WorkMonitorGUI:
         action_frame = ttk.LabelFrame(main_frame, text="Actions", padding="10")
         action_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
         
-        ttk.Button(action_frame, text="Start Work", command=self.start_work, width=20).pack(side=tk.LEFT, padx=5)
-        ttk.Button(action_frame, text="Stop Work", command=self.stop_work, width=20).pack(side=tk.LEFT, padx=5)
-        ttk.Button(action_frame, text="Tabulate Work", command=self.tabulate_work, width=20).pack(side=tk.LEFT, padx=5)
+        # Kept so they can be disabled while a background run is in progress
+        self.action_buttons = [
+            ttk.Button(action_frame, text="Start Work", command=self.start_work, width=20),
+            ttk.Button(action_frame, text="Stop Work", command=self.stop_work, width=20),
+            ttk.Button(action_frame, text="Tabulate Work", command=self.tabulate_work, width=20),
+        ]
+        for button in self.action_buttons:
+            button.pack(side=tk.LEFT, padx=5)
     
     def on_tree_click(self, event):
         """Handle clicks on the treeview to toggle selection."""
@@ -172,36 +370,84 @@ class WorkMonitorGUI:
             if item and column == "#1":  # Clicked on the 'selected' column
                 # Get current selection state
                 values = self.repo_tree.item(item, 'values')
-                if values:
+                # Unavailable repositories have no checkbox to toggle
+                if values and values[0] in TOGGLE:
                     current_state = values[0]
-                    new_state = "☐" if current_state == "☑" else "☑"
+                    new_state = TOGGLE[current_state]
                     
                     # Update the tree
                     path = values[1]
-                    self.repo_tree.item(item, values=(new_state, path))
+                    self.repo_tree.set(item, 'selected', new_state)
+                    self._shown_glyphs[path] = new_state
                     
                     # Update the repository list
-                    for repo in self.repositories:
-                        if repo['path'] == path:
-                            repo['selected'] = (new_state == "☑")
-                            break
+                    if path in self.repositories:
+                        self.repositories[path] = (new_state == GLYPHS[True])
                     
                     # Save changes
-                    self.save_repositories()
+                    self._schedule_save()
+    
+    def _schedule_save(self):
+        """Save the repository list once changes have settled for 500 ms."""
+        self._dirty = True
+        if self._save_pending_id is not None:
+            self.root.after_cancel(self._save_pending_id)
+        self._save_pending_id = self.root.after(500, self._do_save)
+    
+    def _do_save(self):
+        """Write out pending repository changes."""
+        self._save_pending_id = None
+        if self.save_repositories():
+            self._dirty = False
     
     def update_repo_list(self):
-        """Update the treeview with current repository list."""
-        # Clear existing items
-        for item in self.repo_tree.get_children():
-            self.repo_tree.delete(item)
-        
-        # Add repositories
-        for repo in self.repositories:
-            selected = "☑" if repo.get('selected', False) else "☐"
-            self.repo_tree.insert('', tk.END, values=(selected, repo['path']))
+        """Update the treeview with current repository list.
+        
+        Rows are keyed by repository path, so only rows that were added,
+        removed or had their selection changed are touched.
+        """
+        repositories = self.repositories
+        unavailable = self._unavailable
+        shown_glyphs = self._shown_glyphs
+        
+        stale = [path for path in shown_glyphs
+                 if path not in repositories and path not in unavailable]
+        if stale:
+            # One Tcl call for all removed rows
+            self.repo_tree.delete(*stale)
+            for path in stale:
+                del shown_glyphs[path]
+        
+        # Bind the per-row lookups to locals for the loop below
+        insert = self.repo_tree.insert
+        set_cell = self.repo_tree.set
+        get_shown = shown_glyphs.get
+        glyphs = GLYPHS
+        end = tk.END
+        
+        for path, is_selected in repositories.items():
+            selected = glyphs[is_selected]
+            shown = get_shown(path)
+            if shown is None:
+                insert('', end, iid=path, values=(selected, path))
+            elif shown != selected:
+                set_cell(path, 'selected', selected)
+                if shown == UNAVAILABLE:
+                    # Re-added after it became a git repository again
+                    self.repo_tree.item(path, tags=())
+            else:
+                continue
+            shown_glyphs[path] = selected
+        
+        for path in unavailable:
+            if path not in shown_glyphs:
+                insert('', end, iid=path, values=(UNAVAILABLE, path), tags=('unavailable',))
+                shown_glyphs[path] = UNAVAILABLE
     
     def add_repository(self):
         """Add a new repository path."""
+        from tkinter import filedialog, simpledialog
+        
         # Try to get path from file dialog first
         path = filedialog.askdirectory(title="Select Git Repository Directory")
         
@@ -213,18 +459,19 @@ class WorkMonitorGUI:
             path = os.path.abspath(path)
             
             # Check if it's a git repository
-            if not os.path.isdir(os.path.join(path, '.git')):
+            if not has_git_dir(path):
                 messagebox.showerror("Error", f"'{path}' is not a git repository.")
                 return
             
             # Check if already exists
-            if any(r['path'] == path for r in self.repositories):
+            if path in self.repositories:
                 messagebox.showwarning("Warning", "Repository already in list.")
                 return
             
-            # Add to list
-            self.repositories.append({'path': path, 'selected': False})
-            self.save_repositories()
+            # Add to list, replacing any unavailable entry for the same path
+            self._unavailable.pop(path, None)
+            self.repositories[path] = False
+            self._schedule_save()
             self.update_repo_list()
     
     def remove_repository(self):
@@ -235,31 +482,27 @@ class WorkMonitorGUI:
             return
         
         for item in selected_items:
-            values = self.repo_tree.item(item, 'values')
-            if values:
-                path = values[1]
-                self.repositories = [r for r in self.repositories if r['path'] != path]
+            self.repositories.pop(item, None)
+            self._unavailable.pop(item, None)
         
-        self.save_repositories()
+        self._schedule_save()
         self.update_repo_list()
     
     def select_all(self):
         """Select all repositories."""
-        for repo in self.repositories:
-            repo['selected'] = True
-        self.save_repositories()
+        self.repositories = dict.fromkeys(self.repositories, True)
+        self._schedule_save()
         self.update_repo_list()
     
     def deselect_all(self):
         """Deselect all repositories."""
-        for repo in self.repositories:
-            repo['selected'] = False
-        self.save_repositories()
+        self.repositories = dict.fromkeys(self.repositories, False)
+        self._schedule_save()
         self.update_repo_list()
     
     def get_selected_repositories(self):
         """Get list of selected repository paths."""
-        return [r['path'] for r in self.repositories if r.get('selected', False)]
+        return [path for path, selected in self.repositories.items() if selected]
     
     def validate_dates(self):
         """Validate date inputs."""
@@ -268,8 +511,10 @@ class WorkMonitorGUI:
             end_date = self.end_date_var.get().strip()
             
             # Validate format
-            datetime.strptime(start_date, "%Y-%m-%d")
-            datetime.strptime(end_date, "%Y-%m-%d")
+            for value in (start_date, end_date):
+                if not DATE_RE.fullmatch(value):
+                    raise ValueError(value)
+                date.fromisoformat(value)
             
             return start_date, end_date
         except ValueError:
@@ -283,29 +528,7 @@ class WorkMonitorGUI:
             messagebox.showwarning("Warning", "Please select at least one repository.")
             return
         
-        for repo_path in selected:
-            try:
-                result = subprocess.run(
-                    ['startWork', repo_path],
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                if result.returncode != 0:
-                    messagebox.showerror(
-                        "Error",
-                        f"Failed to start work on {repo_path}:\n{result.stderr}"
-                    )
-            except FileNotFoundError:
-                messagebox.showerror(
-                    "Error",
-                    "startWork command not found. Please ensure it's installed and in your PATH."
-                )
-                return
-            except subprocess.TimeoutExpired:
-                messagebox.showerror("Error", f"Timeout starting work on {repo_path}")
-        
-        messagebox.showinfo("Success", f"Started work on {len(selected)} repository(ies).")
+        self.run_work_command('startWork', selected, "start", "starting", "Started")
     
     def stop_work(self):
         """Execute stopWork for selected repositories."""
@@ -314,32 +537,96 @@ class WorkMonitorGUI:
             messagebox.showwarning("Warning", "Please select at least one repository.")
             return
         
-        for repo_path in selected:
+        self.run_work_command('stopWork', selected, "stop", "stopping", "Stopped")
+    
+    def find_command(self, name):
+        """Return the absolute path of a work script, or report it missing."""
+        exe = self._commands[name]
+        if exe is None:
+            messagebox.showerror(
+                "Error",
+                f"{name} command not found. Please ensure it's installed and in your PATH."
+            )
+        return exe
+    
+    def run_work_command(self, name, selected, verb, gerund, done_verb):
+        """Run a work script on each selected repository concurrently and report once."""
+        import subprocess
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        
+        command = self.find_command(name)
+        if command is None:
+            return
+        
+        def work():
+            outcomes = []
+            with ThreadPoolExecutor(max_workers=min(8, len(selected))) as executor:
+                futures = {executor.submit(run_repo_command, command, path): path for path in selected}
+                for future in as_completed(futures):
+                    try:
+                        outcomes.append((futures[future], future.result()))
+                    except (OSError, subprocess.TimeoutExpired) as e:
+                        outcomes.append((futures[future], e))
+            return outcomes
+        
+        def report(outcomes):
+            if isinstance(outcomes, Exception):
+                messagebox.showerror("Error", f"Failed to {verb} work:\n{outcomes}")
+                return
+            
+            errors = []
+            for repo_path, result in outcomes:
+                if isinstance(result, subprocess.TimeoutExpired):
+                    errors.append(f"Timeout {gerund} work on {repo_path}")
+                elif result is not None:
+                    errors.append(f"Failed to {verb} work on {repo_path}:\n{result}")
+            
+            if errors:
+                messagebox.showerror("Error", "\n\n".join(errors))
+            messagebox.showinfo(
+                "Success",
+                f"{done_verb} work on {len(selected) - len(errors)} repository(ies)."
+            )
+        
+        self.run_in_background(work, report)
+    
+    def run_in_background(self, work, done):
+        """Run work() off the Tk thread and pass its result to done() on the Tk thread.
+        
+        The action buttons are disabled until done() runs, so runs never
+        overlap (e.g. a STOP commit racing the START commit it follows).
+        """
+        for button in self.action_buttons:
+            button.state(['disabled'])
+        
+        result = []
+        
+        def run():
+            # Hand any unexpected error to done() rather than losing it
             try:
-                result = subprocess.run(
-                    ['stopWork', repo_path],
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                if result.returncode != 0:
-                    messagebox.showerror(
-                        "Error",
-                        f"Failed to stop work on {repo_path}:\n{result.stderr}"
-                    )
-            except FileNotFoundError:
-                messagebox.showerror(
-                    "Error",
-                    "stopWork command not found. Please ensure it's installed and in your PATH."
-                )
+                result.append(work())
+            except Exception as e:
+                result.append(e)
+        
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        
+        def poll():
+            if thread.is_alive():
+                self.root.after(50, poll)
                 return
-            except subprocess.TimeoutExpired:
-                messagebox.showerror("Error", f"Timeout stopping work on {repo_path}")
+            for button in self.action_buttons:
+                button.state(['!disabled'])
+            if result:
+                done(result[0])
         
-        messagebox.showinfo("Success", f"Stopped work on {len(selected)} repository(ies).")
+        self.root.after(0, poll)
     
     def tabulate_work(self):
         """Execute tabulateWork for selected repositories."""
+        import subprocess
+        from tkinter import filedialog
+        
         selected = self.get_selected_repositories()
         if not selected:
             messagebox.showwarning("Warning", "Please select at least one repository.")
@@ -349,6 +636,10 @@ class WorkMonitorGUI:
         if not start_date or not end_date:
             return
         
+        command = self.find_command('tabulateWork')
+        if command is None:
+            return
+        
         # Ask for output file
         output_file = filedialog.asksaveasfilename(
             title="Save Work Report",
@@ -359,56 +650,99 @@ class WorkMonitorGUI:
         if not output_file:
             return
         
-        try:
-            # Build command
-            cmd = ['tabulateWork', '-o', output_file, start_date, end_date] + selected
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            
-            if result.returncode != 0:
+        # Build command
+        cmd = [command, '-o', output_file, start_date, end_date] + selected
+        
+        def work():
+            # The report goes straight to output_file; only stderr is kept.
+            # There is no timeout, so run it off the Tk thread.
+            try:
+                return subprocess.run(
+                    cmd,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    errors='replace',
+                    env=os.environ
+                )
+            except OSError as e:
+                return e
+        
+        def report(result):
+            if isinstance(result, Exception):
+                messagebox.showerror("Error", f"Failed to generate work report:\n{result}")
+            elif result.returncode != 0:
                 messagebox.showerror(
                     "Error",
                     f"Failed to generate work report:\n{result.stderr}"
                 )
             else:
                 messagebox.showinfo("Success", f"Work report saved to {output_file}")
-        except FileNotFoundError:
-            messagebox.showerror(
-                "Error",
-                "tabulateWork command not found. Please ensure it's installed and in your PATH."
-            )
-        except subprocess.TimeoutExpired:
-            messagebox.showerror("Error", "Timeout generating work report")
+        
+        self.run_in_background(work, report)
     
     def load_repositories(self):
         """Load repository list from file."""
         if CONFIG_FILE.exists():
             try:
-                with open(CONFIG_FILE, 'r') as f:
-                    data = json.load(f)
-                    self.repositories = data.get('repositories', [])
-            except (json.JSONDecodeError, IOError):
-                self.repositories = []
+                data = loads_json(CONFIG_FILE.read_bytes())
+                self.repositories = {}
+                self._unavailable = {}
+                for r in data.get('repositories', []):
+                    path = r['path']
+                    # Entries whose repository has since disappeared are
+                    # listed as unavailable rather than silently dropped
+                    if has_git_dir(path):
+                        self.repositories[path] = r.get('selected', False)
+                    else:
+                        self._unavailable[path] = r.get('selected', False)
+            except (json.JSONDecodeError, IOError, KeyError, TypeError):
+                self.repositories = {}
+                self._unavailable = {}
         else:
-            self.repositories = []
+            self.repositories = {}
     
     def save_repositories(self):
-        """Save repository list to file."""
-        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        """Save repository list to file.
+        
+        The list is written to a temporary file which is then renamed over
+        the config file, so a crash mid-write cannot leave it truncated. The
+        temporary file gets a unique name because the server writes the same
+        config file.
+        """
+        import tempfile
+        
+        tmp_name = None
         try:
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump({'repositories': self.repositories}, f, indent=2)
+            CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=CONFIG_DIR, prefix='.repositories.',
+                                            suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                # mkstemp creates the file owner-only; keep the usual mode
+                os.fchmod(f.fileno(), 0o644)
+                f.write(dumps_json({'repositories': [
+                    {'path': path, 'selected': selected}
+                    for entries in (self.repositories, self._unavailable)
+                    for path, selected in entries.items()
+                ]}))
+            os.replace(tmp_name, CONFIG_FILE)
+            return True
         except IOError as e:
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
             messagebox.showerror("Error", f"Failed to save repositories: {e}")
+            return False
     
     def on_closing(self):
         """Handle window closing."""
-        self.save_repositories()
+        if self._save_pending_id is not None:
+            self.root.after_cancel(self._save_pending_id)
+            self._save_pending_id = None
+        if self._dirty:
+            self._do_save()
         self.root.destroy()
 
 def main():
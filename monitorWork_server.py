@@ -6,25 +6,78 @@ A Flask-based web server for managing work sessions across multiple git reposito
 
 import os
 import sys
+import atexit
 import json
+import shutil
+import stat
 import subprocess
+import tempfile
 import fcntl
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
 from datetime import datetime
 from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 
+# orjson is optional; fall back to the standard library if it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration
-CONFIG_DIR = Path.home() / ".workmonitor"
+HOME_PATH = str(Path.home())  # Looked up once; it can't change while we run
+CONFIG_DIR = Path(HOME_PATH) / ".workmonitor"
 CONFIG_FILE = CONFIG_DIR / "repositories.json"
 LOCK_FILE = CONFIG_DIR / "monitorWork_server.lock"
 DEFAULT_PORT = 5000
 
+# gunicorn settings for --prod. The repository cache, its lock and the work
+# semaphore live in process memory, so one worker process with several
+# threads is used rather than several worker processes.
+GUNICORN_WORKERS = 1
+GUNICORN_THREADS = 8
+
+# Cap on work scripts running at once across all requests, to bound fd usage
+MAX_CONCURRENT_WORK = 16
+
+# Most tabulateWork runs one report request keeps in flight, so a large
+# report doesn't tie up the whole shared EXECUTOR
+MAX_TABULATE_JOBS = 8
+
+# Only this much of a failed script's stderr is decoded and reported
+MAX_STDERR_BYTES = 4096
+
+# In-memory copy of CONFIG_FILE: the repository list, an index of its paths,
+# the raw file bytes, and the file's key (see config_file_key) when it was
+# loaded. Hold _repo_lock across any load-modify-save sequence so concurrent
+# requests don't lose updates.
+_repo_cache = {'key': None, 'data': [], 'paths': set(), 'raw': None}
+_repo_lock = threading.RLock()
+_config_dir_ready = False
+_work_slots = threading.BoundedSemaphore(MAX_CONCURRENT_WORK)
+
+# Shared pool for per-repository fan-out, so requests don't each start and
+# tear down their own threads. Tasks run here must not submit to it.
+EXECUTOR = ThreadPoolExecutor(max_workers=max(8, 4 * (os.cpu_count() or 1)),
+                              thread_name_prefix='wm')
+atexit.register(EXECUTOR.shutdown)
+
 app = Flask(__name__, static_folder='.')
 CORS(app)  # Enable CORS for local development
 
 class SingleInstance:
-    """Ensure only one instance of the server runs at a time."""
+    """Ensure only one instance of the server runs at a time.
+    
+    Uses a POSIX record lock (lockf), which unlike flock also works over
+    NFS. The lock is retried briefly so a quick restart doesn't collide with
+    the previous process still shutting down. Don't open the lock file
+    elsewhere in this process: closing any fd on it releases a lockf lock.
+    """
+    LOCK_ATTEMPTS = 5
+    
     def __init__(self, lock_file):
         self.lock_file = lock_file
         self.lock_fd = None
@@ -33,52 +86,207 @@ class SingleInstance:
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
         
         try:
-            self.lock_fd = open(self.lock_file, 'w')
-            fcntl.flock(self.lock_fd.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-            self.lock_fd.write(str(os.getpid()))
-            self.lock_fd.flush()
+            self.lock_fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+            # Keep the lock fd out of startWork/stopWork/tabulateWork children
+            fcntl.fcntl(self.lock_fd, fcntl.F_SETFD, fcntl.FD_CLOEXEC)
+            for attempt in range(self.LOCK_ATTEMPTS):
+                try:
+                    fcntl.lockf(self.lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except (BlockingIOError, PermissionError):
+                    if attempt == self.LOCK_ATTEMPTS - 1:
+                        raise
+                    time.sleep(0.002)
+            os.ftruncate(self.lock_fd, 0)
+            os.write(self.lock_fd, str(os.getpid()).encode())
             return self
-        except (IOError, OSError):
+        except OSError:
             print(f"Error: monitorWork_server.py is already running.")
             print(f"Check if another instance is running or remove {self.lock_file}")
             sys.exit(1)
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.lock_fd:
+        if self.lock_fd is not None:
             try:
-                fcntl.flock(self.lock_fd.fileno(), fcntl.LOCK_UN)
-                self.lock_fd.close()
+                fcntl.lockf(self.lock_fd, fcntl.LOCK_UN)
+                os.close(self.lock_fd)
                 if self.lock_file.exists():
                     self.lock_file.unlink()
             except:
                 pass
 
-def load_repositories():
-    """Load repository list from file."""
-    if CONFIG_FILE.exists():
+def loads_json(raw):
+    """Parse JSON from bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def dumps_json(obj):
+    """Serialize obj to indented JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+def json_response(payload):
+    """Build a JSON response, serializing with orjson when available."""
+    if orjson is None:
+        return jsonify(payload)
+    return app.response_class(orjson.dumps(payload), mimetype='application/json')
+
+def normalize_path(path):
+    """Expand ~ and make path absolute, skipping work that isn't needed.
+    
+    Equivalent to os.path.abspath(os.path.expanduser(path)), but only calls
+    expanduser for paths starting with ~ and only consults the working
+    directory for relative paths.
+    """
+    if path.startswith('~'):
+        path = os.path.expanduser(path)
+    if os.path.isabs(path):
+        return os.path.normpath(path)
+    return os.path.abspath(path)
+
+def is_git_repository(path):
+    """Return True if path is a git working tree.
+    
+    This is the single git-repository probe used by every endpoint: one stat
+    of path/.git. Bare repositories are deliberately not accepted, since
+    startWork/stopWork commit to a working tree and tabulateWork requires
+    a .git directory.
+    """
+    try:
+        return stat.S_ISDIR(os.stat(os.path.join(path, '.git')).st_mode)
+    except OSError:
+        return False
+
+def is_repository_entry(entry):
+    """Return True if entry looks like {'path': <str>, ...}."""
+    return isinstance(entry, dict) and isinstance(entry.get('path'), str)
+
+def config_file_key():
+    """Return (ino, mtime_ns, size) of the config file, or None if it doesn't exist.
+    
+    Both the GUI and the server replace the file via os.replace, so every
+    write gives it a new inode even when mtime and size don't change.
+    """
+    try:
+        st = os.stat(CONFIG_FILE)
+    except FileNotFoundError:
+        return None
+    return stat_key(st)
+
+def stat_key(st):
+    """Return the cache key for a stat result of the config file."""
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+def refresh_repositories():
+    """Reload the in-memory repository list if CONFIG_FILE changed on disk.
+    
+    The GUI writes the same file, so its key is checked on every call.
+    Must be called with _repo_lock held.
+    """
+    key = config_file_key()
+    if key == _repo_cache['key']:
+        return
+    
+    repositories = []
+    raw = None
+    if key is not None:
         try:
-            with open(CONFIG_FILE, 'r') as f:
-                data = json.load(f)
-                return data.get('repositories', [])
+            with open(CONFIG_FILE, 'rb') as f:
+                raw = f.read()
+            data = loads_json(raw)
+            if isinstance(data, dict) and isinstance(data.get('repositories'), list):
+                # Skip malformed entries rather than failing every request
+                repositories = [r for r in data['repositories'] if is_repository_entry(r)]
         except (json.JSONDecodeError, IOError):
-            return []
-    return []
+            raw = None
+    
+    _repo_cache['key'] = key
+    _repo_cache['raw'] = raw
+    _repo_cache['data'] = repositories
+    _repo_cache['paths'] = {r['path'] for r in repositories}
+
+def load_repositories():
+    """Load repository list; callers get a shallow copy they may modify."""
+    with _repo_lock:
+        refresh_repositories()
+        return list(_repo_cache['data'])
+
+def has_repository(path):
+    """Return True if path is already in the repository list."""
+    with _repo_lock:
+        refresh_repositories()
+        return path in _repo_cache['paths']
+
+def ensure_config_dir():
+    """Create CONFIG_DIR the first time it's needed."""
+    global _config_dir_ready
+    if not _config_dir_ready:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        _config_dir_ready = True
 
 def save_repositories(repositories):
-    """Save repository list to file."""
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    try:
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump({'repositories': repositories}, f, indent=2)
+    """Save repository list to file.
+    
+    The list is written to a temporary file and renamed into place, so
+    readers never see a partially written file. The temporary file gets a
+    unique name because the GUI writes the same config file. Nothing is
+    written if the file already holds exactly these bytes.
+    """
+    global _config_dir_ready
+    # Build the index first so a bad entry fails before anything is written
+    paths = {r['path'] for r in repositories}
+    raw = dumps_json({'repositories': repositories})
+    with _repo_lock:
+        refresh_repositories()
+        if raw == _repo_cache['raw']:
+            return True
+        
+        tmp_name = None
+        try:
+            ensure_config_dir()
+            fd, tmp_name = tempfile.mkstemp(dir=CONFIG_DIR, prefix='.repositories.',
+                                            suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                # mkstemp creates the file owner-only; keep the usual mode
+                os.fchmod(f.fileno(), 0o644)
+                f.write(raw)
+                f.flush()
+                # Take the key before the rename: a stat afterwards could
+                # see a file the GUI wrote in between
+                key = stat_key(os.fstat(f.fileno()))
+            os.replace(tmp_name, CONFIG_FILE)
+        except IOError as e:
+            print(f"Error saving repositories: {e}")
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+            # Re-read whatever is on disk next time, and recreate the
+            # config directory in case it was removed under us
+            _repo_cache['key'] = None
+            _config_dir_ready = False
+            return False
+        
+        # Update the in-memory copy so the next load doesn't re-read the file
+        _repo_cache['key'] = key
+        _repo_cache['raw'] = raw
+        _repo_cache['data'] = list(repositories)
+        _repo_cache['paths'] = paths
         return True
-    except IOError as e:
-        print(f"Error saving repositories: {e}")
-        return False
 
 @app.route('/')
 def index():
-    """Serve the main HTML file."""
-    return send_from_directory('.', 'monitorWork.html')
+    """Serve the main HTML file.
+    
+    Sent as a conditional response (ETag/Last-Modified) marked no-cache, so
+    browsers revalidate on each load and get a 304 while it is unchanged.
+    """
+    response = send_from_directory('.', 'monitorWork.html', conditional=True, max_age=0)
+    response.cache_control.no_cache = True
+    return response
 
 @app.route('/api/scan-repositories', methods=['POST'])
 def scan_repositories():
@@ -96,11 +304,10 @@ def scan_repositories():
         if not folder_path:
             return jsonify({'error': 'Folder path is required'}), 400
         
-        folder_path = os.path.abspath(os.path.expanduser(folder_path))
+        folder_path = normalize_path(folder_path)
         
         # Security: prevent directory traversal outside home directory
-        home_path = str(Path.home())
-        if not folder_path.startswith(home_path):
+        if not folder_path.startswith(HOME_PATH):
             return jsonify({'error': 'Access denied: Cannot scan outside home directory'}), 403
         
         # Check if path exists
@@ -110,12 +317,11 @@ def scan_repositories():
             suggested_paths = []
             if os.path.isdir(parent_dir):
                 try:
-                    for item in os.listdir(parent_dir):
-                        item_path = os.path.join(parent_dir, item)
-                        if os.path.isdir(item_path):
+                    with os.scandir(parent_dir) as entries:
+                        for entry in entries:
                             # Check if it's similar to what they typed
-                            if 'git' in item.lower():
-                                suggested_paths.append(item_path)
+                            if 'git' in entry.name.lower() and entry.is_dir():
+                                suggested_paths.append(entry.path)
                 except:
                     pass
             
@@ -130,13 +336,15 @@ def scan_repositories():
         # Scan for git repositories
         git_repos = []
         try:
-            for item in os.listdir(folder_path):
-                item_path = os.path.join(folder_path, item)
-                if os.path.isdir(item_path) and os.path.isdir(os.path.join(item_path, '.git')):
-                    git_repos.append({
-                        'name': item,
-                        'path': item_path
-                    })
+            # scandir's is_dir() is answered from the directory listing itself,
+            # leaving one stat per subdirectory for the .git probe
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    if entry.is_dir() and is_git_repository(entry.path):
+                        git_repos.append({
+                            'name': entry.name,
+                            'path': entry.path
+                        })
         except (OSError, PermissionError) as e:
             return jsonify({'error': f'Cannot access directory: {str(e)}'}), 403
         
@@ -148,16 +356,29 @@ def scan_repositories():
             'repositories': git_repos
         })
     except Exception as e:
-        import traceback
         error_msg = str(e)
-        traceback.print_exc()
+        app.logger.exception("Error scanning repositories")
         return jsonify({'error': f'Server error: {error_msg}'}), 500
 
 @app.route('/api/repositories', methods=['GET'])
 def get_repositories():
-    """Get list of repositories."""
-    repositories = load_repositories()
-    return jsonify({'repositories': repositories})
+    """Get list of repositories.
+    
+    Tagged with a weak ETag derived from the file's inode, mtime and size, so
+    clients polling an unchanged list get a bodiless 304.
+    """
+    with _repo_lock:
+        refresh_repositories()
+        key = _repo_cache['key']
+        etag = f'W/"{key[0]}-{key[1]}-{key[2]}"' if key else 'W/"none"'
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if request.headers.get('If-None-Match') == etag:
+            return '', 304, headers
+        repositories = list(_repo_cache['data'])
+    
+    response = json_response({'repositories': repositories})
+    response.headers.update(headers)
+    return response
 
 @app.route('/api/repositories', methods=['POST'])
 def add_repository():
@@ -175,27 +396,27 @@ def add_repository():
         if not path:
             return jsonify({'error': 'Path is required'}), 400
         
-        path = os.path.abspath(os.path.expanduser(path))
+        path = normalize_path(path)
         
         # Check if it's a git repository
-        if not os.path.isdir(os.path.join(path, '.git')):
+        if not is_git_repository(path):
             return jsonify({'error': f"'{path}' is not a git repository"}), 400
         
-        repositories = load_repositories()
-        
-        # Check if already exists
-        if any(r['path'] == path for r in repositories):
-            return jsonify({'error': 'Repository already in list'}), 400
-        
-        # Add to list
-        repositories.append({'path': path, 'selected': False})
-        save_repositories(repositories)
+        with _repo_lock:
+            # Check if already exists
+            if has_repository(path):
+                return jsonify({'error': 'Repository already in list'}), 400
+            
+            # Add to list
+            repositories = load_repositories()
+            repositories.append({'path': path, 'selected': False})
+            if not save_repositories(repositories):
+                return jsonify({'error': 'Failed to save repositories'}), 500
         
         return jsonify({'repositories': repositories})
     except Exception as e:
-        import traceback
         error_msg = str(e)
-        traceback.print_exc()
+        app.logger.exception("Error adding repository")
         return jsonify({'error': f'Server error: {error_msg}'}), 500
 
 @app.route('/api/repositories', methods=['DELETE'])
@@ -207,9 +428,13 @@ def remove_repository():
     if not path:
         return jsonify({'error': 'Path is required'}), 400
     
-    repositories = load_repositories()
-    repositories = [r for r in repositories if r['path'] != path]
-    save_repositories(repositories)
+    with _repo_lock:
+        repositories = load_repositories()
+        # Nothing to rewrite if the path isn't in the list
+        if has_repository(path):
+            repositories = [r for r in repositories if r['path'] != path]
+            if not save_repositories(repositories):
+                return jsonify({'error': 'Failed to save repositories'}), 500
     
     return jsonify({'repositories': repositories})
 
@@ -224,8 +449,7 @@ def clear_repositories():
             return jsonify({'error': 'Failed to clear repositories'}), 500
         return jsonify({'repositories': [], 'message': 'All repositories cleared'})
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        app.logger.exception("Error clearing repositories")
         return jsonify({'error': f'Error clearing repositories: {str(e)}'}), 500
 
 @app.route('/api/repositories/batch-add', methods=['POST'])
@@ -244,34 +468,40 @@ def batch_add_repositories():
         if not isinstance(repo_paths, list):
             return jsonify({'error': 'Paths must be a list'}), 400
         
-        repositories = load_repositories()
-        existing_paths = {r['path'] for r in repositories}
-        
         added_count = 0
         errors = []
         
-        for path in repo_paths:
-            path = path.strip()
-            if not path:
-                continue
-                
-            path = os.path.abspath(os.path.expanduser(path))
-            
-            # Check if it's a git repository
-            if not os.path.isdir(os.path.join(path, '.git')):
-                errors.append(f"'{path}' is not a git repository")
-                continue
+        candidates = [
+            normalize_path(path.strip())
+            for path in repo_paths if path.strip()
+        ]
+        
+        # Probe all candidates concurrently; each check is a stat that can
+        # stall on a cold or network filesystem. map() preserves input order.
+        is_git = list(EXECUTOR.map(is_git_repository, candidates))
+        
+        with _repo_lock:
+            repositories = load_repositories()
+            existing_paths = _repo_cache['paths']
+            added_paths = set()
             
-            # Check if already exists
-            if path in existing_paths:
-                continue  # Skip, already in list
+            for path, path_is_git in zip(candidates, is_git):
+                # Check if it's a git repository
+                if not path_is_git:
+                    errors.append(f"'{path}' is not a git repository")
+                    continue
+                
+                # Check if already exists
+                if path in existing_paths or path in added_paths:
+                    continue  # Skip, already in list
+                
+                # Add to list
+                repositories.append({'path': path, 'selected': False})
+                added_paths.add(path)
+                added_count += 1
             
-            # Add to list
-            repositories.append({'path': path, 'selected': False})
-            existing_paths.add(path)
-            added_count += 1
-        
-        save_repositories(repositories)
+            if added_paths and not save_repositories(repositories):
+                return jsonify({'error': 'Failed to save repositories'}), 500
         
         return jsonify({
             'repositories': repositories,
@@ -279,8 +509,7 @@ def batch_add_repositories():
             'errors': errors
         })
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        app.logger.exception("Error adding repositories")
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
 @app.route('/api/repositories/update', methods=['POST'])
@@ -289,37 +518,54 @@ def update_repositories():
     data = request.json
     repositories = data.get('repositories', [])
     
-    save_repositories(repositories)
+    if not isinstance(repositories, list) or not all(is_repository_entry(r) for r in repositories):
+        return jsonify({'error': 'Repositories must be a list of objects with a path'}), 400
+    
+    if not save_repositories(repositories):
+        return jsonify({'error': 'Failed to save repositories'}), 500
     return jsonify({'repositories': repositories})
 
-@app.route('/api/start-work', methods=['POST'])
-def start_work():
-    """Execute startWork for selected repositories."""
-    data = request.json
-    repositories = data.get('repositories', [])
-    
-    if not repositories:
-        return jsonify({'error': 'No repositories selected'}), 400
+def decode_stderr(raw):
+    """Decode at most MAX_STDERR_BYTES of a child's stderr for an error message."""
+    return raw[:MAX_STDERR_BYTES].decode('utf-8', 'replace')
+
+def run_work(command, repo_path):
+    """Run a work script on one repository; return (repo_path, ok, error)."""
+    try:
+        with _work_slots:
+            # Success is signalled by the exit status, so stdout is discarded
+            result = subprocess.run(
+                [command, repo_path],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=30
+            )
+    except subprocess.TimeoutExpired:
+        return repo_path, False, 'Timeout'
+    except OSError as e:
+        # e.g. a script with a bad interpreter line fails to exec
+        return repo_path, False, str(e)
+    if result.returncode != 0:
+        return repo_path, False, decode_stderr(result.stderr)
+    return repo_path, True, ''
+
+def run_work_batch(command, repositories):
+    """Run a work script on each repository concurrently and build the response."""
+    # Check once up front rather than letting every worker hit FileNotFoundError
+    executable = shutil.which(command)
+    if executable is None:
+        return jsonify({'error': f'{command} command not found. Please ensure it\'s installed and in your PATH.'}), 500
     
     results = []
     errors = []
     
-    for repo_path in repositories:
-        try:
-            result = subprocess.run(
-                ['startWork', repo_path],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            if result.returncode != 0:
-                errors.append(f"{repo_path}: {result.stderr}")
-            else:
-                results.append(repo_path)
-        except FileNotFoundError:
-            return jsonify({'error': 'startWork command not found. Please ensure it\'s installed and in your PATH.'}), 500
-        except subprocess.TimeoutExpired:
-            errors.append(f"{repo_path}: Timeout")
+    futures = [EXECUTOR.submit(run_work, executable, repo_path) for repo_path in repositories]
+    for future in as_completed(futures):
+        repo_path, ok, error = future.result()
+        if ok:
+            results.append(repo_path)
+        else:
+            errors.append(f"{repo_path}: {error}")
     
     return jsonify({
         'success': len(results),
@@ -327,6 +573,17 @@ def start_work():
         'results': results
     })
 
+@app.route('/api/start-work', methods=['POST'])
+def start_work():
+    """Execute startWork for selected repositories."""
+    data = request.json
+    repositories = data.get('repositories', [])
+    
+    if not repositories:
+        return jsonify({'error': 'No repositories selected'}), 400
+    
+    return run_work_batch('startWork', repositories)
+
 @app.route('/api/stop-work', methods=['POST'])
 def stop_work():
     """Execute stopWork for selected repositories."""
@@ -336,31 +593,70 @@ def stop_work():
     if not repositories:
         return jsonify({'error': 'No repositories selected'}), 400
     
-    results = []
-    errors = []
+    return run_work_batch('stopWork', repositories)
+
+def run_tabulate(command, output_file, start_date, end_date, repositories):
+    """Run tabulateWork once; return its stderr on failure or None on success."""
+    # The report goes to output_file, so only stderr is kept
+    with _work_slots:
+        result = subprocess.run(
+            [command, '-o', output_file, start_date, end_date] + repositories,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            timeout=60
+        )
+    return decode_stderr(result.stderr) if result.returncode != 0 else None
+
+def tabulate_repositories(command, start_date, end_date, repositories, output_file):
+    """Write the work report for repositories to output_file using command.
     
-    for repo_path in repositories:
-        try:
-            result = subprocess.run(
-                ['stopWork', repo_path],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            if result.returncode != 0:
-                errors.append(f"{repo_path}: {result.stderr}")
-            else:
-                results.append(repo_path)
-        except FileNotFoundError:
-            return jsonify({'error': 'stopWork command not found. Please ensure it\'s installed and in your PATH.'}), 500
-        except subprocess.TimeoutExpired:
-            errors.append(f"{repo_path}: Timeout")
+    tabulateWork scans repositories one after another, so with several
+    repositories each one is tabulated in parallel into its own temp file
+    and the rows are merged here. Rows are re-sorted on the start_time
+    column, as tabulateWork itself does with sort -t',' -k2,2.
+    Returns an error message on failure or None on success.
+    """
+    if len(repositories) == 1:
+        return run_tabulate(command, output_file, start_date, end_date, repositories)
     
-    return jsonify({
-        'success': len(results),
-        'errors': errors,
-        'results': results
-    })
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        parts = [os.path.join(tmp_dir, f'{i}.csv') for i in range(len(repositories))]
+        jobs = list(zip(parts, repositories))
+        running = set()
+        errors = []
+        try:
+            # Keep at most MAX_TABULATE_JOBS submitted at a time
+            while jobs or running:
+                while jobs and len(running) < MAX_TABULATE_JOBS:
+                    part, repo_path = jobs.pop(0)
+                    running.add(EXECUTOR.submit(run_tabulate, command, part, start_date, end_date, [repo_path]))
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    error = future.result()
+                    if error is not None:
+                        errors.append(error)
+        finally:
+            # If a run raised, let the others finish writing into tmp_dir
+            # before it is removed
+            wait(running)
+        if errors:
+            return '\n'.join(errors)
+        
+        header = ''
+        rows = []
+        for part in parts:
+            with open(part) as f:
+                header = f.readline()
+                rows.extend(f)
+        rows.sort(key=lambda row: (row.split(',', 2)[1], row))
+        
+        try:
+            with open(output_file, 'w') as out:
+                out.write(header)
+                out.writelines(rows)
+        except OSError as e:
+            return f"Cannot write {output_file}: {e}"
+    return None
 
 @app.route('/api/tabulate-work', methods=['POST'])
 def tabulate_work():
@@ -388,22 +684,17 @@ def tabulate_work():
         return jsonify({'error': 'Output file is required'}), 400
     
     # Expand ~ to home directory and convert to absolute path
-    output_file = os.path.expanduser(output_file)
-    output_file = os.path.abspath(output_file)
+    output_file = normalize_path(output_file)
+    
+    # Check once up front rather than after submitting a run per repository
+    executable = shutil.which('tabulateWork')
+    if executable is None:
+        return jsonify({'error': 'tabulateWork command not found. Please ensure it\'s installed and in your PATH.'}), 500
     
     try:
-        # Build command
-        cmd = ['tabulateWork', '-o', output_file, start_date, end_date] + repositories
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        
-        if result.returncode != 0:
-            return jsonify({'error': f"Failed to generate work report: {result.stderr}"}), 500
+        error = tabulate_repositories(executable, start_date, end_date, repositories, output_file)
+        if error is not None:
+            return jsonify({'error': f"Failed to generate work report: {error}"}), 500
         
         return jsonify({
             'success': True,
@@ -415,6 +706,26 @@ def tabulate_work():
     except subprocess.TimeoutExpired:
         return jsonify({'error': 'Timeout generating work report'}), 500
 
+def serve_with_gunicorn(host, port, instance):
+    """Replace this process with a gunicorn master serving app."""
+    gunicorn = shutil.which('gunicorn')
+    if gunicorn is None:
+        print("Error: gunicorn is not installed. Install it with: pip3 install gunicorn")
+        sys.exit(1)
+    
+    # The lock fd is normally close-on-exec; let it survive the exec so the
+    # gunicorn master (the same process) keeps holding the single-instance lock
+    os.set_inheritable(instance.lock_fd, True)
+    os.execv(gunicorn, [
+        gunicorn,
+        '--workers', str(GUNICORN_WORKERS),
+        '--worker-class', 'gthread',
+        '--threads', str(GUNICORN_THREADS),
+        '--bind', f'{host}:{port}',
+        '--chdir', os.path.dirname(os.path.abspath(__file__)),
+        'monitorWork_server:app',
+    ])
+
 if __name__ == '__main__':
     import argparse
     
@@ -423,9 +734,14 @@ if __name__ == '__main__':
                         help=f'Port to run the server on (default: {DEFAULT_PORT})')
     parser.add_argument('--host', default='127.0.0.1',
                         help='Host to bind to (default: 127.0.0.1)')
+    parser.add_argument('--prod', action='store_true',
+                        help='Serve with gunicorn instead of the Flask development server')
     args = parser.parse_args()
     
-    with SingleInstance(LOCK_FILE):
+    with SingleInstance(LOCK_FILE) as instance:
+        if args.prod:
+            serve_with_gunicorn(args.host, args.port, instance)
+        
         print(f"Starting WorkMonitor server on http://{args.host}:{args.port}")
         print("Open monitorWork.html in your browser or visit http://127.0.0.1:5000")
         print("Press Ctrl+C to stop the server")